@@ -16,6 +16,62 @@ else:
 logger = logging.getLogger(__name__)
 
 
+def _compile_condition(cond: Union[Dict[str, Any], bool]) -> Callable:
+    """Compile a declarative condition into a predicate closure.
+
+    Runs once per Adjustment so evaluate() executes direct calls instead
+    of re-walking the condition dict on every turn.
+
+    Raises ValueError for anything outside the condition grammar
+    (bool | all | any | not | has | eq | gt), so malformed configs fail
+    at load time instead of silently evaluating to False every turn.
+    """
+    if isinstance(cond, bool):
+        return lambda state, plan, tone, _v=cond: _v
+
+    if isinstance(cond, dict):
+        # Logic operators
+        if "all" in cond:
+            subs = [_compile_condition(c) for c in cond["all"]]
+            return lambda state, plan, tone: all(p(state, plan, tone) for p in subs)
+        if "any" in cond:
+            subs = [_compile_condition(c) for c in cond["any"]]
+            return lambda state, plan, tone: any(p(state, plan, tone) for p in subs)
+        if "not" in cond:
+            sub = _compile_condition(cond["not"])
+            return lambda state, plan, tone: not sub(state, plan, tone)
+
+        # Leaf operators
+        if "has" in cond:
+            key = cond["has"]
+            return lambda state, plan, tone: state.get(key) is not None
+        if "eq" in cond:
+            key = cond["eq"]["key"]
+            expected = cond["eq"]["value"]
+            return lambda state, plan, tone: state.get(key) == expected
+        if "gt" in cond:
+            key = cond["gt"]["key"]
+            threshold = cond["gt"]["value"]
+            return lambda state, plan, tone: float(state.get(key, 0)) > threshold
+
+    raise ValueError(f"Unknown adjustment condition: {cond!r}")
+
+
+# Compiled predicates shared across Adjustment instances. Conditions are
+# plain dict/bool literals, so their repr is a stable cache key; configs
+# loaded repeatedly (one guide per conversation) hit this cache.
+_predicate_cache: Dict[str, Callable] = {}
+
+
+def _get_predicate(cond: Union[Dict[str, Any], bool]) -> Callable:
+    """Return the compiled predicate for a condition, caching by repr."""
+    key = repr(cond)
+    predicate = _predicate_cache.get(key)
+    if predicate is None:
+        predicate = _predicate_cache[key] = _compile_condition(cond)
+    return predicate
+
+
 class Adjustment:
     """Single adjustment rule with safe condition evaluation."""
     
@@ -29,45 +85,15 @@ class Adjustment:
         self.condition = condition
         self.actions = actions
         self.fired = False
-    
+        self._predicate = _get_predicate(condition)
+
     def reset(self):
         """Reset fired flag."""
         self.fired = False
-    
+
     def evaluate_condition(self, state: "State", plan: "Plan", tone: List[str]) -> bool:
-        """Evaluate condition using declarative AST."""
-        if isinstance(self.condition, bool):
-            return self.condition
-            
-        if isinstance(self.condition, dict):
-            return self._eval_condition(self.condition, state, plan, tone)
-            
-        return False
-    
-    def _eval_condition(self, cond: Dict[str, Any], state: "State", plan: "Plan", tone: List[str]) -> bool:
-        """Recursive AST evaluator."""
-        # Logic operators
-        if "all" in cond:
-            return all(self._eval_condition(c, state, plan, tone) for c in cond["all"])
-        if "any" in cond:
-            return any(self._eval_condition(c, state, plan, tone) for c in cond["any"])
-        if "not" in cond:
-            return not self._eval_condition(cond["not"], state, plan, tone)
-            
-        # Leaf operators
-        if "has" in cond:
-            return state.get(cond["has"]) is not None
-        
-        if "eq" in cond:
-            actual = state.get(cond["eq"]["key"])
-            expected = cond["eq"]["value"]
-            return actual == expected
-            
-        if "gt" in cond:
-            val = float(state.get(cond["gt"]["key"], 0))
-            return val > cond["gt"]["value"]
-            
-        return False
+        """Evaluate the precompiled condition predicate."""
+        return self._predicate(state, plan, tone)
 
 
 @dataclass
@@ -106,18 +132,106 @@ class StateSet(Action):
     key: str
     value: Any
 
+# Action handlers, dispatched by action class below. Table lookup keeps
+# _execute_actions free of a per-action isinstance cascade.
+
+def _act_plan_insert_block(action, state, plan, tone):
+    tasks = [Task(id=tid, description="") for tid in action.tasks]
+    plan.insert_block(action.index, Block(tasks))
+
+def _act_plan_remove_block(action, state, plan, tone):
+    plan.remove_block(action.index)
+
+def _act_plan_replace_block(action, state, plan, tone):
+    tasks = [Task(id=tid, description="") for tid in action.tasks]
+    plan.replace_block(action.index, Block(tasks))
+
+def _act_plan_jump(action, state, plan, tone):
+    plan.jump_to(action.index)
+
+def _act_tone_set(action, state, plan, tone):
+    tone.clear()
+    tone.extend(action.tones)
+
+def _act_tone_add(action, state, plan, tone):
+    if action.tone and action.tone not in tone:
+        tone.append(action.tone)
+
+def _act_state_set(action, state, plan, tone):
+    if action.key:
+        state.set(action.key, action.value)
+
+_ACTION_DISPATCH = {
+    PlanInsertBlock: _act_plan_insert_block,
+    PlanRemoveBlock: _act_plan_remove_block,
+    PlanReplaceBlock: _act_plan_replace_block,
+    PlanJump: _act_plan_jump,
+    ToneSet: _act_tone_set,
+    ToneAdd: _act_tone_add,
+    StateSet: _act_state_set,
+}
+
+
+# Legacy dict actions, dispatched by their "type" string
+
+def _legacy_plan_insert_block(action, state, plan, tone):
+    tasks = [Task(id=tid, description="") for tid in action.get("tasks", [])]
+    plan.insert_block(action.get("index", 0), Block(tasks))
+
+def _legacy_plan_remove_block(action, state, plan, tone):
+    plan.remove_block(action.get("index", 0))
+
+def _legacy_plan_replace_block(action, state, plan, tone):
+    tasks = [Task(id=tid, description="") for tid in action.get("tasks", [])]
+    plan.replace_block(action.get("index", 0), Block(tasks))
+
+def _legacy_plan_jump(action, state, plan, tone):
+    plan.jump_to(action.get("index", 0))
+
+def _legacy_tone_set(action, state, plan, tone):
+    tone.clear()
+    tone.extend(action.get("tones", []))
+
+_LEGACY_DISPATCH = {
+    "plan.insert_block": _legacy_plan_insert_block,
+    "plan.remove_block": _legacy_plan_remove_block,
+    "plan.replace_block": _legacy_plan_replace_block,
+    "plan.jump_to": _legacy_plan_jump,
+    "tone.set": _legacy_tone_set,
+}
+
+
 class Adjustments:
     """Adjustment evaluation engine.
-    
+
     Reactive rules watching state and mutating plan/tone/state.
     """
     
     def __init__(self, adjustments: List[Adjustment] = None):
         self._adjustments = adjustments or []
-    
+        self._by_name = {adj.name: adj for adj in self._adjustments}
+        # Fired names in firing order (insertion-ordered dict used as an
+        # ordered set), so snapshots stay deterministic and checkpoints
+        # restore rules in the order they fired
+        self._fired = {adj.name: None for adj in self._adjustments if adj.fired}
+        # Unfired rules only; evaluate() shrinks as rules fire
+        self._pending = [adj for adj in self._adjustments if not adj.fired]
+        # Cached immutable snapshot for pollers; rebuilt after changes
+        self._fired_tuple = None
+
     def add(self, adjustment: Adjustment):
         """Add adjustment rule."""
         self._adjustments.append(adjustment)
+        self._by_name[adjustment.name] = adjustment
+        if adjustment.fired:
+            self._fired[adjustment.name] = None
+            self._fired_tuple = None
+        else:
+            self._pending.append(adjustment)
+
+    def get(self, name: str) -> "Adjustment":
+        """Get adjustment by name (O(1) dict lookup)."""
+        return self._by_name.get(name)
     
     def evaluate(self, state: "State", plan: "Plan", tone: List[str]) -> List[str]:
         """Evaluate all adjustments and execute matching ones.
@@ -125,80 +239,61 @@ class Adjustments:
         Returns list of adjustment names that fired.
         """
         fired_names = []
-        
-        for adj in self._adjustments:
+
+        for adj in self._pending:
+            # _pending is normally pre-filtered, but callers restoring a
+            # checkpoint set adj.fired directly — never re-run those
             if adj.fired:
                 continue
-            
             try:
                 if adj.evaluate_condition(state, plan, tone):
                     self._execute_actions(adj.actions, state, plan, tone)
                     adj.fired = True
+                    self._fired[adj.name] = None
                     fired_names.append(adj.name)
             except Exception as e:
                 # Log the error instead of silently swallowing
                 logger.warning(f"Adjustment '{adj.name}' condition evaluation failed: {e}")
-        
+
+        if fired_names:
+            self._pending = [adj for adj in self._pending if not adj.fired]
+            self._fired_tuple = None
         return fired_names
     
-    def _execute_actions(self, actions: List[Union[Dict[str, Any], Action]], state: "State", 
+    def _execute_actions(self, actions: List[Union[Dict[str, Any], Action]], state: "State",
                         plan: "Plan", tone: List[str]):
-        """Execute adjustment actions."""
+        """Execute adjustment actions via the dispatch tables."""
         for action in actions:
-            # Handle legacy dict actions (for backward compat if needed)
+            # Legacy dict actions (backward compat); note these have
+            # always short-circuited the remaining actions
             if isinstance(action, dict):
-                 # Convert to object (simplified) or execute old logic
-                 # For cleanliness, we'll try to execute logic directly here if it's a dict
-                 action_type = action.get("type")
-                 index = action.get("index", 0)
-                 task_ids = action.get("tasks", [])
-                 
-                 if action_type == "plan.insert_block":
-                     tasks = [Task(id=tid, description="") for tid in task_ids]
-                     plan.insert_block(index, Block(tasks))
-                 elif action_type == "plan.remove_block":
-                     plan.remove_block(index)
-                 elif action_type == "plan.replace_block":
-                     tasks = [Task(id=tid, description="") for tid in task_ids]
-                     plan.replace_block(index, Block(tasks))
-                 elif action_type == "plan.jump_to":
-                     plan.jump_to(index)
-                 elif action_type == "tone.set":
-                     tone.clear()
-                     tone.extend(action.get("tones", []))
-                 return # Skip rest
-
-            # Handle Typed Actions
-            if isinstance(action, PlanInsertBlock):
-                tasks = [Task(id=tid, description="") for tid in action.tasks]
-                plan.insert_block(action.index, Block(tasks))
-            
-            elif isinstance(action, PlanRemoveBlock):
-                plan.remove_block(action.index)
-            
-            elif isinstance(action, PlanReplaceBlock):
-                tasks = [Task(id=tid, description="") for tid in action.tasks]
-                plan.replace_block(action.index, Block(tasks))
-            
-            elif isinstance(action, PlanJump):
-                plan.jump_to(action.index)
-            
-            elif isinstance(action, ToneSet):
-                tone.clear()
-                tone.extend(action.tones)
-            
-            elif isinstance(action, ToneAdd):
-                if action.tone and action.tone not in tone:
-                    tone.append(action.tone)
-            
-            elif isinstance(action, StateSet):
-                if action.key:
-                    state.set(action.key, action.value)
+                handler = _LEGACY_DISPATCH.get(action.get("type"))
+                if handler:
+                    handler(action, state, plan, tone)
+                return
+
+            handler = _ACTION_DISPATCH.get(type(action))
+            if handler:
+                handler(action, state, plan, tone)
     
+    @property
+    def fired_names(self) -> tuple:
+        """Names of adjustments that have fired (cached immutable snapshot).
+
+        Returned by reference, so UI pollers reading this every render
+        allocate nothing; call list() on it if a mutable copy is needed.
+        """
+        if self._fired_tuple is None:
+            self._fired_tuple = tuple(self._fired)
+        return self._fired_tuple
+
     def reset_all(self):
         """Reset all fired flags."""
         for adj in self._adjustments:
             adj.reset()
+        self._fired.clear()
+        self._fired_tuple = None
+        self._pending = list(self._adjustments)
     
     def to_dict(self) -> dict:
         """Export adjustments as dict."""
@@ -0,0 +1,57 @@
+"""Cached YAML loading for prompt templates."""
+
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Union
+
+import yaml
+
+try:
+    # C-accelerated loader when libyaml is available
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+
+def _sidecar(p: Path) -> Path:
+    """Pickle sidecar location: always next to the source YAML."""
+    return p.with_suffix(p.suffix + ".pkl")
+
+
+@lru_cache(maxsize=16)
+def _load(path_str: str, mtime: float) -> Any:
+    p = Path(path_str)
+
+    # Warm start: unpickling the parsed dict is far cheaper than YAML
+    # parsing. Only trusted when at least as new as the source file.
+    # The sidecar lives strictly next to the YAML (same dir, same
+    # ownership) — never in a shared tempdir, where another local user
+    # could plant a malicious pickle at a predictable path.
+    pkl = _sidecar(p)
+    try:
+        if pkl.exists() and pkl.stat().st_mtime >= mtime:
+            return pickle.loads(pkl.read_bytes())
+    except Exception:
+        pass  # stale/corrupt sidecar: fall through to the YAML
+
+    with open(path_str, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_Loader)
+
+    try:
+        pkl.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass  # read-only install dir: every cold start just parses YAML
+    return data
+
+
+def load_yaml_cached(path: Union[str, Path]) -> Any:
+    """Load a YAML file, re-parsing only when its mtime changes.
+
+    Keyed on (path, mtime): dev-server reloads re-read only after the
+    file is edited, and production processes parse each template once.
+    A pickle sidecar next to the YAML makes cold starts in fresh
+    processes cheap too; read-only installs simply skip it.
+    """
+    p = Path(path)
+    return _load(str(p), p.stat().st_mtime)
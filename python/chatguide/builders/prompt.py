@@ -1,8 +1,10 @@
+import hashlib
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
-import yaml
+from operator import itemgetter
+from typing import Collection, List, Dict, Any, Optional
 from pathlib import Path
 from ..core.task import Task
+from ._yaml_cache import load_yaml_cached
 
 
 # ============================================================
@@ -14,12 +16,16 @@ class PromptView:
     """View model for prompt generation."""
     current_task: Optional[Task]
     pending_tasks: List[Task]
-    completed_tasks: List[str]
+    # Set or list both fine: only used for membership tests, so the
+    # guide passes its completed set as-is instead of copying to a list
+    completed_tasks: Collection[str]
     state: Dict[str, Any]
     tone_text: str
     guardrails: str
     history: List[Dict[str, str]]
     language: str = "en"
+    history_window: int = 10  # Max history messages shown in the prompt
+    history_summary: str = ""  # Condensed text of messages dropped from history
     next_block_task: Optional[Task] = None  # First task of next block
     recent_extractions: List[Dict[str, Any]] = None  # Last N extractions for corrections
     last_error: Optional[str] = None  # Validation error from previous response
@@ -29,15 +35,115 @@ class PromptView:
 # Prompt Builder (REFACTORED)
 # ============================================================
 
+# Static section skeleton rendered once at import; per-turn build() only
+# fills the placeholders instead of re-assembling the f-string
+_CONTEXT_TEMPLATE = """CONTEXT
+-------
+Conversation history:
+{history}
+
+STYLE CHECK:
+Look at the last message in history.
+- If you started the last message with "Ah," or "Great,", you are FORBIDDEN from doing it again now.
+- If you used the user's name in the last message, do NOT use it in this one.
+
+Known facts (verified — do NOT re-ask):
+{state}
+
+Recent extractions (last values captured — user may correct these):
+{extractions}
+
+CONVERSATION TIPS:
+- Don't repeat the same acknowledgment patterns from history
+- If you see repetitive questions in history, try a different approach
+- Stay conversational and natural, not robotic"""
+
+# Messages are produced by ChatGuide with both keys always present, so
+# the C-level itemgetter replaces two dict.get calls per message
+_role_content = itemgetter("role", "content")
+
+_OBJECTIVE_TEMPLATE = """OBJECTIVE
+---------
+{error_instruction}
+
+Current task:
+{current_task}
+
+Next task (after completion):
+{next_task}
+
+Tone:
+{tone}
+
+RESPONSE STRATEGY:
+- If you CAN extract the expected information: acknowledge briefly and move forward
+- If you CANNOT extract information: acknowledge the user's response naturally, then rephrase and ask again
+- Vary your language - don't repeat the same phrases or questions
+- Keep the conversation flowing even when extraction fails
+- If user gives nonsense/irrelevant answers, acknowledge it lightly and redirect
+
+Output Format:
+- task_results: put here all extracted/corrected values from the user's response. If a key already exists in state, overwrite it. Include both new extractions and corrections to recent values.
+- tools: if the task requires the use of a tool, add the tool id and options to the tools key.
+General:
+- After completing the current task, smoothly transition to the next task in the same reply."""
+
+# Only the expected-keys line varies per turn; the schema example and
+# rules (500+ bytes) are spliced by reference instead of re-embedded
+_RESPONSE_CONTRACT_TEMPLATE = """RESPONSE FORMAT
+---------------
+Respond ONLY with valid JSON:
+
+{{
+  "assistant_reply": "Natural response shown to the user",
+  "task_results": [
+    {{
+      "task_id": "task_name",
+      "key": "state_variable_name",
+      "value": "extracted_value_or_null"
+    }}
+  ],
+  "tools": []
+}}
+
+MANDATORY EXTRACTION RULES:
+- Expected keys: {expected_keys}
+- OUTPUT EXACTLY ONE task_result FOR EACH expected key (no more, no less)
+- Use value: null if you cannot extract a meaningful value
+- NO MISSING task_results entries - every expected key must be present
+- NO EXTRA keys - only output keys listed in expected keys
+- value can be null but key must be present in task_results
+
+RESPONSE GUIDANCE WHEN EXTRACTION FAILS:
+- If all values are null: Provide a natural response acknowledging what user said, then rephrase your question differently
+- Don't repeat the same question verbatim - vary your approach
+- Stay conversational and engaging even when you can't extract information
+- If user is being difficult, remain patient and professional
+
+Constraints:
+- assistant_reply: Natural conversational response to user (vary your acknowledgments)
+- task_results: One entry per expected key, value can be string or null
+- tools: Leave empty array [] (tools not used in minimal v1)"""
+
 class PromptBuilder:
     """Builds a clean, structured prompt from config and state."""
 
     _lang_templates: Dict[str, Dict[str, Any]] = None
+    # Rendered system role per language, shared by all builder instances
+    _system_role_cache: Dict[str, str] = {}
+    # blake2b id of the prefix per language (see prefix_id)
+    _prefix_id_cache: Dict[str, str] = {}
 
     def __init__(self, view: PromptView):
         self.view = view
         if PromptBuilder._lang_templates is None:
             self._load_language_templates()
+        # Resolved once per builder; _get_lang is called several times
+        # per build and the language never changes mid-instance
+        self._lang = self._lang_templates.get(
+            view.language,
+            self._lang_templates.get("en", {})
+        )
 
     # --------------------------------------------------
     # Language templates
@@ -46,23 +152,53 @@ class PromptBuilder:
     @classmethod
     def _load_language_templates(cls):
         template_path = Path(__file__).parent.parent / "core" / "core_prompt.yaml"
-        with open(template_path, "r", encoding="utf-8") as f:
-            cls._lang_templates = yaml.safe_load(f)
+        cls._lang_templates = load_yaml_cached(template_path)
 
     def _get_lang(self, key: str, default: str = "") -> str:
-        lang_data = self._lang_templates.get(
-            self.view.language,
-            self._lang_templates.get("en", {})
-        )
-        return lang_data.get(key, default)
+        return self._lang.get(key, default)
 
     # --------------------------------------------------
     # Public entry point
     # --------------------------------------------------
 
     def build(self) -> str:
+        prefix = self.build_prefix()
+        suffix = self.build_suffix()
+        return "\n\n".join(s for s in (prefix, suffix) if s).strip()
+
+    def build_prefix(self) -> str:
+        """Build the session-stable part of the prompt.
+
+        Contains only sections that are invariant across turns (system role,
+        style rules). Callers can cache this and reuse it turn-to-turn,
+        which also keeps the prompt prefix byte-stable for providers with
+        prefix caching.
+        """
+        cached = self._system_role_cache.get(self.view.language)
+        if cached is None:
+            cached = self._system_role().strip()
+            PromptBuilder._system_role_cache[self.view.language] = cached
+        return cached
+
+    @property
+    def prefix_id(self) -> str:
+        """Stable 128-bit hex id of the session prompt prefix.
+
+        Byte-identical prefixes hash identically across turns and
+        processes, so integrators can hand this to providers that take
+        an explicit prompt-cache key and reuse the prefill KV cache.
+        """
+        cached = self._prefix_id_cache.get(self.view.language)
+        if cached is None:
+            cached = hashlib.blake2b(
+                self.build_prefix().encode("utf-8"), digest_size=16
+            ).hexdigest()
+            PromptBuilder._prefix_id_cache[self.view.language] = cached
+        return cached
+
+    def build_suffix(self) -> str:
+        """Build the per-turn part of the prompt (history, state, task)."""
         sections = [
-            self._system_role(),
             self._context_section(),
             self._objective_section(),
             self._response_contract(),
@@ -95,28 +231,11 @@ CRITICAL STYLE RULES:
         )
 
     def _context_section(self) -> str:
-        return f"""
-CONTEXT
--------
-Conversation history:
-{self._format_history()}
-
-STYLE CHECK:
-Look at the last message in history.
-- If you started the last message with "Ah," or "Great,", you are FORBIDDEN from doing it again now.
-- If you used the user's name in the last message, do NOT use it in this one.
-
-Known facts (verified — do NOT re-ask):
-{self._format_state()}
-
-Recent extractions (last values captured — user may correct these):
-{self._format_recent_extractions()}
-
-CONVERSATION TIPS:
-- Don't repeat the same acknowledgment patterns from history
-- If you see repetitive questions in history, try a different approach
-- Stay conversational and natural, not robotic
-""".strip()
+        return _CONTEXT_TEMPLATE.format(
+            history=self._format_history(),
+            state=self._format_state(),
+            extractions=self._format_recent_extractions(),
+        )
 
     def _objective_section(self) -> str:
         error_instruction = ""
@@ -128,33 +247,12 @@ You MUST inform the user why their previous answer was invalid and ask for a val
 Do NOT acknowledge the invalid value as if it were true.
 """
 
-        return f"""
-OBJECTIVE
----------
-{error_instruction}
-
-Current task:
-{self._format_current_task()}
-
-Next task (after completion):
-{self._format_next_task()}
-
-Tone:
-{self.view.tone_text}
-
-RESPONSE STRATEGY:
-- If you CAN extract the expected information: acknowledge briefly and move forward
-- If you CANNOT extract information: acknowledge the user's response naturally, then rephrase and ask again
-- Vary your language - don't repeat the same phrases or questions
-- Keep the conversation flowing even when extraction fails
-- If user gives nonsense/irrelevant answers, acknowledge it lightly and redirect
-
-Output Format:
-- task_results: put here all extracted/corrected values from the user's response. If a key already exists in state, overwrite it. Include both new extractions and corrections to recent values.
-- tools: if the task requires the use of a tool, add the tool id and options to the tools key.
-General:
-- After completing the current task, smoothly transition to the next task in the same reply.
-""".strip()
+        return _OBJECTIVE_TEMPLATE.format(
+            error_instruction=error_instruction,
+            current_task=self._format_current_task(),
+            next_task=self._format_next_task(),
+            tone=self.view.tone_text,
+        )
 
     def _response_contract(self) -> str:
         # Get expected keys for current task
@@ -165,58 +263,26 @@ General:
 
         expected_keys_str = ", ".join(f'"{k}"' for k in expected_keys) if expected_keys else "none"
 
-        return f"""
-RESPONSE FORMAT
----------------
-Respond ONLY with valid JSON:
-
-{{
-  "assistant_reply": "Natural response shown to the user",
-  "task_results": [
-    {{
-      "task_id": "task_name",
-      "key": "state_variable_name",
-      "value": "extracted_value_or_null"
-    }}
-  ],
-  "tools": []
-}}
-
-MANDATORY EXTRACTION RULES:
-- Expected keys: {expected_keys_str}
-- OUTPUT EXACTLY ONE task_result FOR EACH expected key (no more, no less)
-- Use value: null if you cannot extract a meaningful value
-- NO MISSING task_results entries - every expected key must be present
-- NO EXTRA keys - only output keys listed in expected keys
-- value can be null but key must be present in task_results
-
-RESPONSE GUIDANCE WHEN EXTRACTION FAILS:
-- If all values are null: Provide a natural response acknowledging what user said, then rephrase your question differently
-- Don't repeat the same question verbatim - vary your approach
-- Stay conversational and engaging even when you can't extract information
-- If user is being difficult, remain patient and professional
-
-Constraints:
-- assistant_reply: Natural conversational response to user (vary your acknowledgments)
-- task_results: One entry per expected key, value can be string or null
-- tools: Leave empty array [] (tools not used in minimal v1)
-""".strip()
+        return _RESPONSE_CONTRACT_TEMPLATE.format(expected_keys=expected_keys_str)
 
     # ==================================================
     # Formatting helpers (largely preserved)
     # ==================================================
 
     def _format_history(self) -> str:
-        if not self.view.history:
+        # [-0:] would be the full list, so a zero window needs its own branch
+        window = self.view.history_window
+        recent = self.view.history[-window:] if window > 0 else []
+        if not recent and not self.view.history_summary:
             return self._get_lang("none", "(No messages yet)")
 
-        lines = []
-        for msg in self.view.history[-10:]:
-            role = msg.get("role", "unknown")
-            content = msg.get("content", "")
-            lines.append(f"{role}: {content}")
-
-        return "\n".join(lines)
+        lines = "\n".join(
+            f"{role}: {content}"
+            for role, content in map(_role_content, recent)
+        )
+        if self.view.history_summary:
+            return f"(Earlier conversation, summarized): {self.view.history_summary}\n{lines}"
+        return lines
 
     def _format_state(self) -> str:
         if not self.view.state:
@@ -261,29 +327,26 @@ Constraints:
         if not self.view.pending_tasks:
             return self._get_lang("none", "(None)")
 
-        lines = []
         current_task_id = self.view.current_task.id if self.view.current_task else None
 
-        for task in self.view.pending_tasks:
-            is_current = (task.id == current_task_id)
-            prefix = "(current task)" if is_current else ""
-            lines.append(f"Task: {task.id} {prefix}")
-            lines.append(f"Description: {task.description}")
-
-            if task.expects:
-                expects = []
-                for exp in task.expects:
-                    if hasattr(exp, "key"):
-                        expects.append(exp.key)
-                    else:
-                        expects.append(str(exp))
-                lines.append(f"Expected to collect: {', '.join(expects)}")
-
-            if task.tools:
-                lines.append("Available tools:")
-                for tool_def in task.tools:
-                    lines.append(f"  - {tool_def.get('tool', 'unknown')}")
-
-            lines.append("")
-
-        return "\n".join(lines).strip()
+        def lines():
+            for task in self.view.pending_tasks:
+                prefix = "(current task)" if task.id == current_task_id else ""
+                yield f"Task: {task.id} {prefix}"
+                yield f"Description: {task.description}"
+
+                if task.expects:
+                    expects = ", ".join(
+                        exp.key if hasattr(exp, "key") else str(exp)
+                        for exp in task.expects
+                    )
+                    yield f"Expected to collect: {expects}"
+
+                if task.tools:
+                    yield "Available tools:"
+                    for tool_def in task.tools:
+                        yield f"  - {tool_def.get('tool', 'unknown')}"
+
+                yield ""
+
+        return "\n".join(lines()).strip()
@@ -1,20 +1,48 @@
 """ChatGuide - lean conversational agent framework."""
 
+import hashlib
+import sys
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Union, List
 from .schemas import ChatGuideReply, ExpectDefinition, TaskResult
 from .core.task import Task
 from .builders.prompt import PromptBuilder, PromptView
-from .io.llm import run_llm
 from .utils.config_loader import load_config_file, validate_config, normalize_expects
 from .utils.response_parser import parse_llm_response
 
 
+# Walking the Pydantic model is pure and the model never changes at
+# runtime, so the response schema is built once at import; the frozen
+# extra_config wrapper saves the per-call dict literal too
+_REPLY_SCHEMA = ChatGuideReply.model_json_schema()
+_EXTRA_CONFIG = MappingProxyType({"response_schema": _REPLY_SCHEMA})
+
+
 class ChatGuide:
     """State-driven conversational agent."""
-    
-    def __init__(self, api_key: str = None, config: Any = None, debug: bool = False):
+
+    # One instance per user session in server deployments: slots drop
+    # the per-instance __dict__ and make self.* loads fixed-offset reads
+    __slots__ = (
+        "api_key", "debug", "history_window", "config_path",
+        "state", "config",
+        "_prompt_prefix", "_prompt_builder",
+        "_key_to_tasks", "_total_tasks", "_has_validations",
+        "_task_cache", "_silent_task_ids", "_summarizer",
+        "_task_expect_keys",
+        "_response_cache", "_response_cache_size",
+    )
+
+
+    def __init__(self, api_key: str = None, config: Any = None, debug: bool = False,
+                 history_window: int = 10):
         self.api_key = api_key
         self.debug = debug
+        # How many trailing messages each prompt includes; bounds prompt
+        # size (and LLM prefill cost) on long conversations
+        if history_window < 0:
+            raise ValueError(f"history_window must be >= 0, got {history_window}")
+        self.history_window = history_window
         self.config_path = config if isinstance(config, str) else None  # Store path for reloading
 
         # === SINGLE SOURCE OF TRUTH ===
@@ -26,6 +54,7 @@ class ChatGuide:
             "completed": set(),   # Completed task IDs
             "recent_keys": [],    # Recent keys in order of extraction/correction
             "last_error": None,   # Store validation errors here
+            "summary": "",        # Condensed text of dropped history (see set_summarizer)
         }
 
         # === STATIC CONFIG (loaded once) ===
@@ -37,6 +66,39 @@ class ChatGuide:
             "language": "en",
         }
 
+        # Cached session-stable prompt prefix (see PromptBuilder.build_prefix)
+        self._prompt_prefix = None
+
+        # Builder reused across turns; only its view is swapped per turn
+        self._prompt_builder = None
+
+        # Reverse index: expected key -> task IDs that collect it
+        self._key_to_tasks = {}
+
+        # Total planned tasks, cached so progress polls don't re-sum blocks
+        self._total_tasks = 0
+
+        # True when any expect actually validates (number/enum); lets
+        # _process_reply take a plain store-values path otherwise
+        self._has_validations = False
+
+        # Task objects built once per config; _make_task reuses them
+        self._task_cache = {}
+
+        # IDs of silent tasks, frozen at load for per-turn membership tests
+        self._silent_task_ids = frozenset()
+
+        # Optional callback that condenses dropped history (see set_summarizer)
+        self._summarizer = None
+
+        # task_id -> tuple of expected keys, precomputed at load; completion
+        # checks and reply processing run every turn and only read these
+        self._task_expect_keys = {}
+
+        # Opt-in LLM reply cache (see enable_response_cache)
+        self._response_cache = None
+        self._response_cache_size = 0
+
         if config:
             self._load_config(config)
 
@@ -69,27 +131,73 @@ class ChatGuide:
         """Load configuration with validation."""
         data = config if isinstance(config, dict) else load_config_file(config)
 
+        # Config changes can affect the static prompt sections and the
+        # builder's resolved language templates
+        self._prompt_prefix = None
+        self._prompt_builder = None
+
         # Validate config
         errors = validate_config(data)
         if errors:
             error_msg = "Configuration validation failed:\n" + "\n".join(f"- {err}" for err in errors)
             raise ValueError(error_msg)
 
-        # Blocks (plan)
-        self.config["blocks"] = data.get("plan", [])
+        # Blocks (plan). Task IDs and expected keys are short strings
+        # compared and hashed constantly, so intern them once here.
+        self.config["blocks"] = [[sys.intern(tid) for tid in b] for b in data.get("plan", [])]
+        self._total_tasks = sum(len(b) for b in self.config["blocks"])
 
         # Tasks
         for task_id, task_def in data.get("tasks", {}).items():
             expects = task_def.get("expects", [])
             # Normalize expects using the new function
             normalized = normalize_expects(expects)
+            for exp in normalized:
+                exp.key = sys.intern(exp.key)
 
-            self.config["tasks"][task_id] = {
+            self.config["tasks"][sys.intern(task_id)] = {
                 "description": task_def.get("description", ""),
                 "expects": normalized,
                 "silent": task_def.get("silent", False),
             }
         
+        # Rebuild the key -> tasks reverse index
+        self._key_to_tasks = {}
+        for task_id, tdef in self.config["tasks"].items():
+            for exp in tdef["expects"]:
+                self._key_to_tasks.setdefault(exp.key, []).append(task_id)
+
+        # Task definitions are immutable after load, so build the Task
+        # objects handed to PromptBuilder once instead of per prompt
+        self._task_cache = {
+            task_id: Task(
+                id=task_id,
+                description=tdef["description"],
+                expects=tdef["expects"],
+                silent=tdef["silent"],
+            )
+            for task_id, tdef in self.config["tasks"].items()
+        }
+
+        self._task_expect_keys = {
+            task_id: tuple(exp.key for exp in tdef["expects"])
+            for task_id, tdef in self.config["tasks"].items()
+        }
+
+        # Tasks are immutable after load, so the silent flag collapses
+        # to one frozenset membership test per turn
+        self._silent_task_ids = frozenset(
+            task_id for task_id, tdef in self.config["tasks"].items() if tdef["silent"]
+        )
+
+        # Plain string expects never fail validate_value, so configs
+        # without number/enum expects can skip validation entirely
+        self._has_validations = any(
+            exp.type != "string"
+            for tdef in self.config["tasks"].values()
+            for exp in tdef["expects"]
+        )
+
         # Tone
         tone_ids = data.get("tone", [])
         tone_defs = data.get("tones", {})
@@ -114,8 +222,9 @@ class ChatGuide:
         """Execute one chat turn. Re-asks if task not complete due to null values."""
         retry_count = 0
         while retry_count < max_retries:
-            task = self._current_task()
-            is_silent = task and task.get("silent", False)
+            task_id = self._current_task_id()
+            task = self.config["tasks"].get(task_id) if task_id else None
+            is_silent = task_id in self._silent_task_ids
 
             if self.debug:
                 block_idx = self.state["block"]
@@ -132,12 +241,12 @@ class ChatGuide:
             prompt = self._build_prompt()
             reply = self._call_llm(prompt, model, api_key or self.api_key)
 
-            # Update state
-            self._process_reply(reply)
+            # Update state; _process_reply reports task completion so the
+            # pending case skips a redundant _task_is_complete pass
+            completed = self._process_reply(reply)
 
-            # Check if current task is complete
             current_task_id = self._current_task_id()
-            if current_task_id and not self._task_is_complete(current_task_id):
+            if current_task_id and (completed is False or not self._task_is_complete(current_task_id)):
                 # Task not complete due to null values - re-ask by continuing the loop
                 retry_count += 1
                 if retry_count < max_retries:
@@ -162,9 +271,66 @@ class ChatGuide:
                 self.state["messages"].append({"role": "assistant", "content": reply.assistant_reply})
                 return reply
     
+    async def chat_async(self, model: str = "gemini/gemini-2.0-flash-exp", api_key: str = None, max_retries: int = 2) -> ChatGuideReply:
+        """Async wrapper around chat() for event-loop servers.
+
+        Runs the blocking turn (LLM call included) in the default
+        executor so FastAPI/websocket handlers can serve many
+        conversations on one loop without stalling it. Each guide
+        instance must still only process one turn at a time.
+        """
+        import asyncio
+        from functools import partial
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(self.chat, model=model, api_key=api_key, max_retries=max_retries)
+        )
+
     def add_user_message(self, message: str):
         """Add user message."""
         self.state["messages"].append({"role": "user", "content": message})
+        self._maybe_summarize()
+
+    def set_summarizer(self, fn):
+        """Install a history summarizer: fn(summary, dropped_messages) -> str.
+
+        Without one, the transcript grows unbounded (only the prompt
+        window is sent to the LLM). With one, messages older than the
+        prompt window are periodically collapsed into state["summary"],
+        which the prompt surfaces ahead of recent history — bounding
+        both memory and prefill cost on very long sessions.
+        """
+        self._summarizer = fn
+
+    def enable_response_cache(self, maxsize: int = 128):
+        """Cache LLM replies by prompt so byte-identical turns skip the call.
+
+        Useful for deterministic flows and replayed/retried turns where
+        history, state and plan position — and therefore the prompt —
+        match a previous turn exactly. Replies that request tools are
+        never cached (their side effects must run). Opt-in because it
+        trades response freshness for latency; entries are evicted LRU
+        once maxsize is reached.
+        """
+        from collections import OrderedDict
+        self._response_cache = OrderedDict()
+        self._response_cache_size = maxsize
+
+    def _maybe_summarize(self):
+        """Collapse old messages into the summary once history is 3x the window."""
+        if self._summarizer is None:
+            return
+        messages = self.state["messages"]
+        window = self.history_window
+        if len(messages) <= window * 3:
+            return
+        # [:-0] / [-0:] invert for a zero window, so branch explicitly
+        if window > 0:
+            dropped, kept = messages[:-window], messages[-window:]
+        else:
+            dropped, kept = messages, []
+        self.state["messages"] = kept
+        self.state["summary"] = self._summarizer(self.state.get("summary", ""), dropped)
     
     # =========== STATE HELPERS ===========
     
@@ -200,7 +366,7 @@ class ChatGuide:
     
     def get_progress(self) -> Dict:
         """Get progress info."""
-        total = sum(len(b) for b in self.config["blocks"])
+        total = self._total_tasks
         completed = len(self.state["completed"])
         return {
             "completed": completed,
@@ -235,11 +401,13 @@ class ChatGuide:
         view = PromptView(
             current_task=current_task,
             pending_tasks=pending,
-            completed_tasks=list(self.state["completed"]),
+            completed_tasks=self.state["completed"],
             state=self.state["data"],
             tone_text=self.config["tone"] or "Natural and helpful",
             guardrails=self.config["guardrails"],
             history=self.state["messages"],
+            history_window=self.history_window,
+            history_summary=self.state.get("summary", ""),
             language=self.config["language"],
             next_block_task=next_block_task,
             recent_extractions=recent_extractions,
@@ -247,55 +415,81 @@ class ChatGuide:
         # Inject the error into the view manually or add a field
         view.last_error = self.state.get("last_error")
 
-        return PromptBuilder(view).build()
+        if self._prompt_builder is None:
+            self._prompt_builder = PromptBuilder(view)
+        else:
+            self._prompt_builder.view = view
+        builder = self._prompt_builder
+        if self._prompt_prefix is None:
+            self._prompt_prefix = builder.build_prefix()
+        suffix = builder.build_suffix()
+        return "\n\n".join(s for s in (self._prompt_prefix, suffix) if s).strip()
     
     def _make_task(self, task_id: str) -> Optional[Task]:
-        """Create Task object from config."""
+        """Get the cached Task object for a config task."""
         if not task_id:
             return None
-        tdef = self.config["tasks"].get(task_id, {})
-        return Task(
-            id=task_id,
-            description=tdef.get("description", ""),
-            expects=tdef.get("expects", []),
-            silent=tdef.get("silent", False),
-        )
+        return self._task_cache.get(task_id)
     
     def _call_llm(self, prompt: str, model: str, api_key: str) -> ChatGuideReply:
         """Call LLM."""
+        # Deferred so importing the package (or restoring state, adding
+        # messages, testing) never touches the IO layer; provider SDKs
+        # themselves are lazy inside io.llm
+        from .io.llm import run_llm
+
+        cache = self._response_cache
+        if cache is not None:
+            cache_key = hashlib.blake2b(
+                f"{model}\x00{prompt}".encode("utf-8"), digest_size=16
+            ).digest()
+            cached = cache.get(cache_key)
+            if cached is not None:
+                cache.move_to_end(cache_key)
+                return cached
+
         try:
             result = run_llm(
                 prompt, model=model, api_key=api_key,
-                extra_config={"response_schema": ChatGuideReply.model_json_schema()}
+                extra_config=_EXTRA_CONFIG
             )
-            return parse_llm_response(result.content)
+            reply = parse_llm_response(result.content)
+            if cache is not None and not reply.tools:
+                cache[cache_key] = reply
+                if len(cache) > self._response_cache_size:
+                    cache.popitem(last=False)
+            return reply
         except Exception as e:
             if self.debug:
                 print(f"[ERROR] {e}")
             return ChatGuideReply(assistant_reply=f"Error: {e}", task_results=[], tools=[])
     
-    def _process_reply(self, reply: ChatGuideReply):
-        """Process reply: update state, complete tasks, advance."""
+    def _process_reply(self, reply: ChatGuideReply) -> Optional[bool]:
+        """Process reply: update state, complete tasks, advance.
+
+        Returns whether the current task completed (None when there was
+        no current task), so chat() doesn't re-derive it from state.
+        """
         self.state["last_error"] = None  # Reset error at start of processing
 
         current_task_id = self._current_task_id()
         if not current_task_id:
-            return
+            return None
 
         current_task_def = self.config["tasks"].get(current_task_id, {})
-        expected_keys = [exp.key for exp in current_task_def.get("expects", [])]
+        expected_keys = self._task_expect_keys.get(current_task_id, ())
+        expected_set = set(expected_keys)
 
-        # 1. STRICT KEY WHITELIST: Only accept keys listed in current task's expects
-        filtered_results = []
-        for tr in reply.task_results:
-            if tr.key in expected_keys:
-                filtered_results.append(tr)
-            elif self.debug:
-                print(f"[WARNING] Rejected unexpected key '{tr.key}' from task results (not in expects)")
+        # 1. STRICT KEY WHITELIST + DEDUPE: one order-preserving dict pass,
+        # last value per key wins (later results carry the final value)
+        result_dict = {tr.key: tr for tr in reply.task_results if tr.key in expected_set}
+        if self.debug:
+            for tr in reply.task_results:
+                if tr.key not in expected_set:
+                    print(f"[WARNING] Rejected unexpected key '{tr.key}' from task results (not in expects)")
 
         # 2. MANDATORY EXTRACTION ENTRIES: Ensure one result per expected key
         # Create TaskResult objects for missing keys with value=None
-        result_dict = {tr.key: tr for tr in filtered_results}
         complete_results = []
 
         for expected_key in expected_keys:
@@ -311,45 +505,56 @@ class ChatGuide:
                 if self.debug:
                     print(f"[DEBUG] Added missing result for key '{expected_key}' with null value")
 
-        # 3. VALIDATION & UPDATE (REPLACE YOUR STEP 3 WITH THIS)
-        for tr in complete_results:
-            # Skip validation if value is already None
-            if tr.value is None:
-                continue
+        # 3. VALIDATION & UPDATE
+        if not self._has_validations:
+            # Specialized path: no number/enum expects anywhere in the
+            # config, so values can be stored without the matching loop
+            for tr in complete_results:
+                if tr.value is None:
+                    continue
+                self.state["data"][tr.key] = tr.value
+                if tr.key not in self.state["recent_keys"]:
+                    self.state["recent_keys"].append(tr.key)
+        else:
+            for tr in complete_results:
+                # Skip validation if value is already None
+                if tr.value is None:
+                    continue
 
-            # Find the expectation definition for this key
-            expects = current_task_def.get("expects", [])
+                # Find the expectation definition for this key
+                expects = current_task_def.get("expects", [])
 
-            # Perform validation
-            is_valid = True
-            error_msg = ""
+                # Perform validation
+                is_valid = True
+                error_msg = ""
 
-            # Find the specific ExpectDefinition for this key
-            matching_exp = next((e for e in expects if e.key == tr.key), None)
+                # Find the specific ExpectDefinition for this key
+                matching_exp = next((e for e in expects if e.key == tr.key), None)
 
-            if matching_exp:
-                # Use the validate_value method from ExpectDefinition
-                is_valid, error_msg = matching_exp.validate_value(tr.value)
+                if matching_exp:
+                    # Use the validate_value method from ExpectDefinition
+                    is_valid, error_msg = matching_exp.validate_value(tr.value)
 
-            if is_valid:
-                self.state["data"][tr.key] = tr.value
-                if tr.key not in self.state["recent_keys"]:
-                    self.state["recent_keys"].append(tr.key)
-            else:
-                # VALIDATION FAILED
-                if self.debug:
-                    print(f"[VALIDATION FAIL] Key: {tr.key}, Value: {tr.value}, Error: {error_msg}")
+                if is_valid:
+                    self.state["data"][tr.key] = tr.value
+                    if tr.key not in self.state["recent_keys"]:
+                        self.state["recent_keys"].append(tr.key)
+                else:
+                    # VALIDATION FAILED
+                    if self.debug:
+                        print(f"[VALIDATION FAIL] Key: {tr.key}, Value: {tr.value}, Error: {error_msg}")
 
-                # 1. Don't save the data (keep it None/old)
-                # 2. Set the error so the Prompt knows to complain
-                self.state["last_error"] = f"User provided '{tr.value}' for '{tr.key}', but that is invalid: {error_msg}. Ask them to correct it."
+                    # 1. Don't save the data (keep it None/old)
+                    # 2. Set the error so the Prompt knows to complain
+                    self.state["last_error"] = f"User provided '{tr.value}' for '{tr.key}', but that is invalid: {error_msg}. Ask them to correct it."
 
-                # If one fails, we stop processing results to ensure we ask about this one
-                # (Optional: you could collect all errors)
-                break
+                    # If one fails, we stop processing results to ensure we ask about this one
+                    # (Optional: you could collect all errors)
+                    break
 
         # 4. Check if current task is complete (all non-null)
-        if self._task_is_complete(current_task_id):
+        completed = self._task_is_complete(current_task_id)
+        if completed:
             self.state["completed"].add(current_task_id)
             if self.debug:
                 print(f"[DEBUG] Completed task '{current_task_id}' (all expected keys have non-null values)")
@@ -359,12 +564,13 @@ class ChatGuide:
                 if self.debug:
                     print(f"[DEBUG] Block {self.state['block']} complete, advancing to block {self.state['block'] + 1}")
                 self.state["block"] += 1
+        return completed
 
     def _task_is_complete(self, task_id: str) -> bool:
         """Check if task is complete: all expected keys have non-null values."""
-        task_def = self.config["tasks"].get(task_id, {})
-        expected_keys = [exp.key for exp in task_def.get("expects", [])]
-        return all(self.state["data"].get(key) is not None for key in expected_keys)
+        data = self.state["data"]
+        return all(data.get(key) is not None
+                   for key in self._task_expect_keys.get(task_id, ()))
 
     def _validate_runtime_state(self):
         """Validate runtime state for consistency."""
@@ -403,14 +609,16 @@ class ChatGuide:
     
     def _block_complete(self) -> bool:
         """Check if current block is complete."""
-        return all(tid in self.state["completed"] for tid in self._current_block_tasks())
+        # issuperset runs in C; all(... in ...) pays generator overhead per id
+        return self.state["completed"].issuperset(self._current_block_tasks())
     
     def _find_task_for_key(self, key: str) -> Optional[str]:
-        """Find task that expects this key."""
-        for task_id in self._current_block_tasks():
-            task_def = self.config["tasks"].get(task_id, {})
-            for exp in task_def.get("expects", []):
-                exp_key = exp.key if hasattr(exp, "key") else exp
-                if exp_key == key:
-                    return task_id
+        """Find task in the current block that expects this key."""
+        candidates = self._key_to_tasks.get(key)
+        if not candidates:
+            return None
+        block_tasks = self._current_block_tasks()
+        for task_id in candidates:
+            if task_id in block_tasks:
+                return task_id
         return None
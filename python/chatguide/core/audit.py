@@ -1,21 +1,66 @@
 """AuditLog - append-only change tracking."""
 
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Union
+from collections import defaultdict
 from datetime import datetime
-from dataclasses import dataclass, asdict
 
 
-@dataclass
+def _iso_to_ns(iso: str) -> int:
+    """Convert an ISO timestamp to epoch nanoseconds (exactly).
+
+    float multiplication is lossy at epoch-ns magnitude (~±256 ns),
+    enough to nondeterministically exclude an entry from a search whose
+    `since` is that entry's own exported timestamp. Seconds and
+    microseconds are combined in integer arithmetic instead.
+    """
+    dt = datetime.fromisoformat(iso)
+    return int(dt.replace(microsecond=0).timestamp()) * 10**9 + dt.microsecond * 1000
+
+
+def _ns_to_iso(ns: int) -> str:
+    """Format epoch nanoseconds as an ISO timestamp (truncated to µs).
+
+    Exact integer split, so search(since=<exported timestamp>) always
+    includes the entry it came from (entry ns >= its truncated µs)."""
+    secs, rem = divmod(ns, 10**9)
+    return datetime.fromtimestamp(secs).replace(microsecond=rem // 1000).isoformat()
+
+
 class AuditEntry:
-    """Single audit log entry."""
-    timestamp: str
-    key: str
-    old_value: Any
-    new_value: Any
-    source_task: Optional[str] = None
-    
+    """Single audit log entry.
+
+    Slotted: logs can hold many entries, and skipping the per-instance
+    __dict__ keeps them small with faster attribute access.
+    """
+
+    __slots__ = ("timestamp", "key", "old_value", "new_value", "source_task", "_cached_dict")
+
+    def __init__(self, timestamp: int, key: str, old_value: Any, new_value: Any,
+                 source_task: Optional[str] = None):
+        self.timestamp = timestamp  # epoch nanoseconds; formatted to ISO only on export
+        self.key = key
+        self.old_value = old_value
+        self.new_value = new_value
+        self.source_task = source_task
+        # Entries are immutable after construction, so the exported dict is
+        # built once and reused across repeated search/to_list calls
+        self._cached_dict: Optional[Dict[str, Any]] = None
+
+    def __repr__(self):
+        return (f"AuditEntry(key={self.key!r}, new_value={self.new_value!r}, "
+                f"source_task={self.source_task!r})")
+
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "timestamp": _ns_to_iso(self.timestamp),
+                "key": self.key,
+                "old_value": self.old_value,
+                "new_value": self.new_value,
+                "source_task": self.source_task,
+            }
+        return self._cached_dict
 
 
 class AuditLog:
@@ -23,17 +68,27 @@ class AuditLog:
     
     def __init__(self):
         self._entries: List[AuditEntry] = []
-    
+        # Secondary indices so key/task queries don't scan the full log
+        self._by_key: Dict[str, List[AuditEntry]] = defaultdict(list)
+        self._by_task: Dict[str, List[AuditEntry]] = defaultdict(list)
+
+    def _append(self, entry: AuditEntry):
+        """Append an entry and keep the secondary indices in sync."""
+        self._entries.append(entry)
+        self._by_key[entry.key].append(entry)
+        if entry.source_task is not None:
+            self._by_task[entry.source_task].append(entry)
+
     def log(self, key: str, old_value: Any, new_value: Any, source_task: Optional[str] = None):
         """Log a state change."""
         entry = AuditEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp=time.time_ns(),
             key=key,
             old_value=old_value,
             new_value=new_value,
             source_task=source_task
         )
-        self._entries.append(entry)
+        self._append(entry)
     
     def search(
         self, 
@@ -51,22 +106,25 @@ class AuditLog:
         Returns:
             List of matching audit entries
         """
-        results = self._entries
-        
+        # Start from the narrowest index, then apply remaining filters
         if key:
-            results = [e for e in results if e.key == key]
-        
-        if task:
-            results = [e for e in results if e.source_task == task]
-        
+            results = self._by_key.get(key, [])
+            if task:
+                results = [e for e in results if e.source_task == task]
+        elif task:
+            results = self._by_task.get(task, [])
+        else:
+            results = self._entries
+
         if since:
-            results = [e for e in results if e.timestamp >= since]
-        
+            since_ns = _iso_to_ns(since)
+            results = [e for e in results if e.timestamp >= since_ns]
+
         return [e.to_dict() for e in results]
-    
+
     def get_latest(self, key: str) -> Optional[Dict[str, Any]]:
-        """Get the most recent change for a key."""
-        entries = [e for e in self._entries if e.key == key]
+        """Get the most recent change for a key (O(1) via key index)."""
+        entries = self._by_key.get(key)
         if entries:
             return entries[-1].to_dict()
         return None
@@ -74,11 +132,32 @@ class AuditLog:
     def to_list(self) -> List[Dict[str, Any]]:
         """Export all entries as list."""
         return [e.to_dict() for e in self._entries]
-    
+
+    def to_json_bytes(self) -> bytes:
+        """Export the log straight to JSON bytes.
+
+        For callers that only want to persist the log, this skips the
+        str decode/encode round-trip; the per-entry dicts are cached so
+        repeated exports reuse them.
+        """
+        from ..utils import fast_json
+        return fast_json.dumpb([e.to_dict() for e in self._entries])
+
     @classmethod
     def from_list(cls, data: List[Dict[str, Any]]) -> "AuditLog":
         """Restore audit log from list."""
         log = cls()
         for entry_data in data:
-            log._entries.append(AuditEntry(**entry_data))
+            ts = entry_data.get("timestamp")
+            if isinstance(ts, str):
+                # Exported entries carry ISO timestamps; convert back
+                ts = _iso_to_ns(ts)
+            # Positional construction: no kwargs dict expansion per entry
+            log._append(AuditEntry(
+                ts,
+                entry_data["key"],
+                entry_data.get("old_value"),
+                entry_data.get("new_value"),
+                entry_data.get("source_task"),
+            ))
         return log
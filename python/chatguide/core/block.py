@@ -8,7 +8,8 @@ class Block:
     
     def __init__(self, tasks: List[Task]):
         self.tasks = tasks
-        
+        self._expects_index = None
+
     @property
     def task_ids(self) -> List[str]:
         """Get list of task IDs in this block."""
@@ -28,10 +29,33 @@ class Block:
             if task.id == task_id:
                 return task
         return None
+
+    def get_task_for_key(self, key: str) -> Task:
+        """Get the task whose expects (or ID) include this key.
+
+        Backed by a lazily-built reverse index so repeated lookups are O(1)
+        instead of rescanning every task's expects.
+        """
+        if self._expects_index is None:
+            index = {}
+            for task in self.tasks:
+                index.setdefault(task.id, task)
+                for exp in task.expects:
+                    exp_key = exp.key if hasattr(exp, "key") else exp
+                    if isinstance(exp_key, str):
+                        index.setdefault(exp_key, task)
+            self._expects_index = index
+        return self._expects_index.get(key)
         
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize block."""
+        """Serialize block, classifying status in the same pass."""
+        tasks = []
+        completed = 0
+        for t in self.tasks:
+            tasks.append(t.to_dict())
+            if t.is_completed():
+                completed += 1
         return {
-            "tasks": [t.to_dict() for t in self.tasks],
-            "status": "completed" if self.is_complete() else "pending"
+            "tasks": tasks,
+            "status": "completed" if completed == len(tasks) else "pending"
         }
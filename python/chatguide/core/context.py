@@ -1,17 +1,27 @@
 """Context - manages conversation history and session metadata."""
 
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 
 class Message:
     """Represents a single message in the conversation."""
-    
+
     def __init__(self, role: str, content: str, timestamp: Optional[str] = None):
         self.role = role
         self.content = content
-        self.timestamp = timestamp or datetime.now().isoformat()
-    
+        # Capture a cheap epoch float now; ISO formatting is deferred to
+        # first read since most messages are never serialized
+        self._timestamp = timestamp
+        self._created = None if timestamp is not None else time.time()
+
+    @property
+    def timestamp(self) -> str:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created).isoformat()
+        return self._timestamp
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "role": self.role,
@@ -28,6 +38,11 @@ class Context:
         self.metadata = metadata or {}
         self._history: List[Message] = []
         self.created_at = datetime.now().isoformat()
+        # Running per-role stats so snapshots don't need history scans
+        self._user_count = 0
+        self._assistant_count = 0
+        self._last_user: Optional[str] = None
+        self._last_assistant: Optional[str] = None
     
     @property
     def history(self) -> List[Message]:
@@ -39,6 +54,32 @@ class Context:
         if role not in ("user", "assistant"):
             raise ValueError(f"Invalid role: {role}. Must be 'user' or 'assistant'.")
         self._history.append(Message(role, content))
+        if role == "user":
+            self._user_count += 1
+            self._last_user = content
+        else:
+            self._assistant_count += 1
+            self._last_assistant = content
+
+    @property
+    def user_message_count(self) -> int:
+        """Number of user messages (O(1), maintained on append)."""
+        return self._user_count
+
+    @property
+    def assistant_message_count(self) -> int:
+        """Number of assistant messages (O(1), maintained on append)."""
+        return self._assistant_count
+
+    @property
+    def last_user_message(self) -> Optional[str]:
+        """Content of the most recent user message, if any."""
+        return self._last_user
+
+    @property
+    def last_assistant_message(self) -> Optional[str]:
+        """Content of the most recent assistant message, if any."""
+        return self._last_assistant
     
     def get_history_dict(self) -> List[Dict[str, str]]:
         """Get history as list of dicts (for LLM prompts)."""
@@ -60,10 +101,18 @@ class Context:
         ctx.created_at = data.get("created_at", datetime.now().isoformat())
         
         for msg_data in data.get("history", []):
+            role = msg_data["role"]
+            content = msg_data["content"]
             ctx._history.append(Message(
-                role=msg_data["role"],
-                content=msg_data["content"],
+                role=role,
+                content=content,
                 timestamp=msg_data.get("timestamp")
             ))
-        
+            if role == "user":
+                ctx._user_count += 1
+                ctx._last_user = content
+            elif role == "assistant":
+                ctx._assistant_count += 1
+                ctx._last_assistant = content
+
         return ctx
@@ -1,5 +1,6 @@
+import sys
 from enum import Enum
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
 
 class ExecStatus(str, Enum):
     IDLE = "idle"
@@ -16,10 +17,34 @@ class ExecutionState:
     
     Note: Pending UI tools are managed by ToolExecutor (single source of truth).
     """
-    
+
+    __slots__ = ("_current_task", "_status", "_completed", "_completed_cache")
+
     def __init__(self):
         self._current_task: Optional[str] = None
         self._status: ExecStatus = ExecStatus.IDLE
+        # Dict instead of list: O(1) membership with insertion order kept
+        self._completed: Dict[str, None] = {}
+        # Cached immutable view; rebuilt only after a new completion
+        self._completed_cache: Optional[Tuple[str, ...]] = None
+
+    def mark_complete(self, task_id: str):
+        """Record a task as completed (idempotent, O(1))."""
+        if task_id not in self._completed:
+            # Interned: later membership checks are pointer comparisons
+            self._completed[sys.intern(task_id)] = None
+            self._completed_cache = None
+
+    def is_completed(self, task_id: str) -> bool:
+        """Check whether a task has been completed."""
+        return task_id in self._completed
+
+    @property
+    def completed(self) -> Tuple[str, ...]:
+        """Completed task IDs in completion order (immutable, no copy per call)."""
+        if self._completed_cache is None:
+            self._completed_cache = tuple(self._completed)
+        return self._completed_cache
     
     @property
     def current_task(self) -> Optional[str]:
@@ -60,6 +85,10 @@ class ExecutionState:
                     raise ValueError(f"Invalid status: {value}")
                 # Silently ignore invalid status in production
     
+    def is_waiting_for_user(self) -> bool:
+        """True when execution is blocked on user input."""
+        return self._status == ExecStatus.WAITING_USER
+
     def progress(self, completed_count: int, total_tasks: int) -> Dict[str, Any]:
         """Calculate progress metrics."""
         percent = int((completed_count / total_tasks * 100)) if total_tasks > 0 else 0
@@ -75,14 +104,17 @@ class ExecutionState:
         """Export execution state as dict."""
         return {
             "current_task": self._current_task,
-            "status": self._status.value
+            "status": self._status.value,
+            "completed": list(self.completed)
         }
-    
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ExecutionState":
         """Restore execution state from dict."""
         state = cls()
         state._current_task = data.get("current_task")
+        # JSON restore yields fresh string objects; intern to dedupe
+        state._completed = dict.fromkeys(sys.intern(t) for t in data.get("completed", []))
         # Ignore pending_tools from old checkpoints (ephemeral UI state)
         state.status = data.get("status", "idle")
         return state
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 """Multi-provider LLM dispatcher; isolates third-party SDKs from core logic."""
 
-from typing import Any, Optional
+from typing import Any, List, Optional
 
-__all__ = ["run_llm"]
+__all__ = ["run_llm", "run_llm_batch"]
 
 
 from dataclasses import dataclass
@@ -57,6 +57,41 @@ def run_llm(
         raise NotImplementedError(f"Provider '{provider}' not supported")
 
 
+def run_llm_batch(
+    prompts: List[str],
+    *,
+    model: str = "gemini/gemini-2.5-flash-lite",
+    api_key: Optional[str] = None,
+    temperature: float = 0.6,
+    max_tokens: int = 256,
+    extra_config: Optional[dict[str, Any]] = None,
+    max_workers: int = 8,
+) -> List[LLMResult]:
+    """Run several independent prompts concurrently.
+
+    Useful for server workloads driving many sessions at once: the calls
+    are network-bound, so dispatching them over a thread pool amortizes
+    round-trip latency. Results are returned in prompt order; a failed
+    call raises just as it would with run_llm.
+    """
+    if not prompts:
+        return []
+    if len(prompts) == 1:
+        return [run_llm(prompts[0], model=model, api_key=api_key,
+                        temperature=temperature, max_tokens=max_tokens,
+                        extra_config=extra_config)]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _one(prompt: str) -> LLMResult:
+        return run_llm(prompt, model=model, api_key=api_key,
+                       temperature=temperature, max_tokens=max_tokens,
+                       extra_config=extra_config)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+        return list(pool.map(_one, prompts))
+
+
 # -----------------------------------------------------------------------------
 # Provider implementations
 # -----------------------------------------------------------------------------
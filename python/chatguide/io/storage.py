@@ -1,7 +1,8 @@
 """Storage adapters for persisting conversation state."""
 
 from typing import Dict, Any, Optional
-import json
+
+from ..utils import fast_json
 
 
 class StorageAdapter:
@@ -53,7 +54,7 @@ class SupabaseStorage(StorageAdapter):
         """Save conversation state to Supabase."""
         data = {
             "id": conversation_id,
-            "state": json.dumps(state_dict),
+            "state": fast_json.dumps(state_dict),
             "updated_at": "now()"
         }
         
@@ -65,7 +66,7 @@ class SupabaseStorage(StorageAdapter):
         result = self.client.table(self.table).select("state").eq("id", conversation_id).execute()
         
         if result.data and len(result.data) > 0:
-            return json.loads(result.data[0]["state"])
+            return fast_json.loads(result.data[0]["state"])
         return None
     
     def delete(self, conversation_id: str):
@@ -94,14 +95,14 @@ class RedisStorage(StorageAdapter):
     def save(self, conversation_id: str, state_dict: Dict[str, Any]):
         """Save conversation state to Redis."""
         key = f"{self.key_prefix}{conversation_id}"
-        self.client.set(key, json.dumps(state_dict))
+        self.client.set(key, fast_json.dumps(state_dict))
     
     def load(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """Load conversation state from Redis."""
         key = f"{self.key_prefix}{conversation_id}"
         data = self.client.get(key)
         if data:
-            return json.loads(data)
+            return fast_json.loads(data)
         return None
     
     def delete(self, conversation_id: str):
@@ -112,35 +113,111 @@ class RedisStorage(StorageAdapter):
 
 class FileStorage(StorageAdapter):
     """Store conversation state in local JSON files.
-    
+
     Usage:
         storage = FileStorage(directory="conversations")
         storage.save("user_123", guide.get_state())
+
+        # Cheap per-turn saves: append only what changed
+        storage.save_delta("user_123", guide.get_state())
     """
-    
-    def __init__(self, directory: str = "conversations"):
-        """Initialize file storage."""
+
+    _MISSING = object()
+
+    def __init__(self, directory: str = "conversations", pretty: bool = False):
+        """Initialize file storage.
+
+        Args:
+            directory: Where conversation files are written
+            pretty: Indent saved JSON for human inspection; compact
+                (the default) roughly halves file size on big histories
+        """
         from pathlib import Path
         self.directory = Path(directory)
         self.directory.mkdir(exist_ok=True)
-    
+        self.pretty = pretty
+        # Last state written per conversation, used to compute deltas
+        self._last_snapshot: Dict[str, Dict[str, Any]] = {}
+
+    def _delta_path(self, conversation_id: str):
+        return self.directory / f"{conversation_id}.deltas.jsonl"
+
     def save(self, conversation_id: str, state_dict: Dict[str, Any]):
-        """Save conversation state to file."""
+        """Save full conversation state to file."""
+        import copy
         file_path = self.directory / f"{conversation_id}.json"
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(state_dict, f, indent=2, ensure_ascii=False)
-    
+            f.write(fast_json.dumps(state_dict, pretty=self.pretty))
+        # Full dump supersedes any accumulated deltas
+        delta_path = self._delta_path(conversation_id)
+        if delta_path.exists():
+            delta_path.unlink()
+        self._last_snapshot[conversation_id] = copy.deepcopy(state_dict)
+
+    def save_delta(self, conversation_id: str, state_dict: Dict[str, Any]):
+        """Append only the keys changed since the last save.
+
+        Writes a JSON-lines sidecar instead of rewriting the full state,
+        so per-turn I/O stays constant even as message history grows.
+        The message list is treated as append-only: when the previous
+        messages are a prefix of the new ones, only the tail is stored.
+        Falls back to a full save when there is no baseline yet.
+        """
+        import copy
+        base = self._last_snapshot.get(conversation_id)
+        if base is None:
+            self.save(conversation_id, state_dict)
+            return
+
+        delta: Dict[str, Any] = {"changed": {}}
+        removed = [k for k in base if k not in state_dict]
+        if removed:
+            delta["removed"] = removed
+        for key, value in state_dict.items():
+            old = base.get(key, self._MISSING)
+            if (key == "messages" and isinstance(value, list)
+                    and isinstance(old, list) and value[:len(old)] == old):
+                if len(value) > len(old):
+                    delta["messages_append"] = value[len(old):]
+                continue
+            if old is self._MISSING or old != value:
+                delta["changed"][key] = value
+
+        if delta["changed"] or removed or "messages_append" in delta:
+            with open(self._delta_path(conversation_id), 'a', encoding='utf-8') as f:
+                f.write(fast_json.dumps(delta) + "\n")
+        self._last_snapshot[conversation_id] = copy.deepcopy(state_dict)
+
     def load(self, conversation_id: str) -> Optional[Dict[str, Any]]:
-        """Load conversation state from file."""
+        """Load conversation state from file, replaying any deltas."""
         file_path = self.directory / f"{conversation_id}.json"
-        if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
-    
+        if not file_path.exists():
+            return None
+        with open(file_path, 'r', encoding='utf-8') as f:
+            state = fast_json.loads(f.read())
+
+        delta_path = self._delta_path(conversation_id)
+        if delta_path.exists():
+            with open(delta_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    delta = fast_json.loads(line)
+                    state.update(delta.get("changed", {}))
+                    for key in delta.get("removed", []):
+                        state.pop(key, None)
+                    if "messages_append" in delta:
+                        state.setdefault("messages", []).extend(delta["messages_append"])
+        return state
+
     def delete(self, conversation_id: str):
         """Delete conversation file."""
         file_path = self.directory / f"{conversation_id}.json"
         if file_path.exists():
             file_path.unlink()
+        delta_path = self._delta_path(conversation_id)
+        if delta_path.exists():
+            delta_path.unlink()
+        self._last_snapshot.pop(conversation_id, None)
 
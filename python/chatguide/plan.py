@@ -1,6 +1,6 @@
 """Plan - ordered sequence of task blocks with manipulation methods."""
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from .core.block import Block
 from .core.task import Task
 
@@ -9,11 +9,15 @@ class Plan:
     
     Manages a sequence of Block objects.
     """
-    
+
+    __slots__ = ("_blocks", "_current_index", "_task_index")
+
     def __init__(self, blocks: List[Block] = None):
         self._blocks: List[Block] = blocks or []
         self._current_index = 0
-    
+        # Lazy task-id index; rebuilt after structural edits
+        self._task_index: Optional[dict] = None
+
     def get_current_block(self) -> Optional[Block]:
         """Get current task block."""
         if self._current_index < len(self._blocks):
@@ -39,31 +43,38 @@ class Plan:
     def insert_block(self, index: int, block: Block):
         """Insert task block at index."""
         self._blocks.insert(index, block)
-    
+        self._task_index = None
+
     def remove_block(self, index: int):
         """Remove block at index."""
         if 0 <= index < len(self._blocks):
             self._blocks.pop(index)
-    
+            self._task_index = None
+
     def replace_block(self, index: int, block: Block):
         """Replace block at index."""
         if 0 <= index < len(self._blocks):
             self._blocks[index] = block
+            self._task_index = None
             
+    def iter_tasks(self) -> Iterator[Task]:
+        """Iterate all tasks in plan order without building a list."""
+        for block in self._blocks:
+            yield from block.tasks
+
     def get_all_tasks(self) -> List[Task]:
         """Get all tasks in the plan."""
-        tasks = []
-        for block in self._blocks:
-            tasks.extend(block.tasks)
-        return tasks
+        return list(self.iter_tasks())
         
     def get_task(self, task_id: str) -> Optional[Task]:
-        """Find a task by ID anywhere in the plan."""
-        for block in self._blocks:
-            task = block.get_task(task_id)
-            if task:
-                return task
-        return None
+        """Find a task by ID anywhere in the plan (O(1) via index)."""
+        if self._task_index is None:
+            index = {}
+            for task in self.iter_tasks():
+                # First occurrence wins, matching the old linear scan
+                index.setdefault(task.id, task)
+            self._task_index = index
+        return self._task_index.get(task_id)
     
     def is_finished(self) -> bool:
         """Check if plan is complete."""
@@ -1,7 +1,9 @@
 """State - flat dictionary with template resolution and audit tracking."""
 
 import re
-from typing import Any, Dict, Optional
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 # Avoid circular import - audit will be injected
 if False:
@@ -20,6 +22,8 @@ class State:
         object.__setattr__(self, '_data', initial or {})
         object.__setattr__(self, '_audit_log', audit_log)
         object.__setattr__(self, '_recent_keys', [])
+        # Read-only live view shared by all .variables reads (no per-call copy)
+        object.__setattr__(self, '_variables_view', MappingProxyType(self._data))
     
     def get(self, key: str, default=None) -> Any:
         """Get value from state."""
@@ -27,6 +31,9 @@ class State:
     
     def set(self, key: str, value: Any, source_task: Optional[str] = None):
         """Set value in state with optional audit logging."""
+        # Keys are short, heavily reused strings - intern for pointer-fast
+        # dict lookups and set membership downstream
+        key = sys.intern(key)
         old_value = self._data.get(key)
         self._data[key] = value
 
@@ -43,6 +50,24 @@ class State:
         for key, value in data.items():
             self.set(key, value, source_task)
 
+    def bulk_set(self, data: Dict[str, Any], source_task: Optional[str] = None):
+        """Merge many keys in a single dict update.
+
+        Without an audit log this is one C-level dict.update instead of
+        a Python-level set() per key; with auditing enabled it falls
+        back to per-key sets so every change is still logged.
+        """
+        if not data:
+            return
+        if self._audit_log is not None:
+            self.update(data, source_task)
+            return
+        interned = {sys.intern(k): v for k, v in data.items()}
+        self._data.update(interned)
+        for key in interned:
+            if key not in self._recent_keys:
+                self._recent_keys.append(key)
+
     def get_typed(self, key: str, type_: type, default=None) -> Any:
         """Get value with type checking."""
         val = self._data.get(key, default)
@@ -81,9 +106,15 @@ class State:
         return re.sub(pattern, replacer, text)
     
     @property
-    def variables(self) -> Dict[str, Any]:
-        """Get clean dict of all variables (business data only)."""
-        return self._data.copy()
+    def variables(self) -> Mapping[str, Any]:
+        """Read-only live view of all variables (business data only).
+
+        NOTE: this used to return a fresh dict snapshot; it is now a
+        live MappingProxyType that tracks later mutations and is not a
+        dict — serializers that need a plain dict (e.g. json.dumps)
+        must copy with dict(state.variables) explicitly.
+        """
+        return self._variables_view
 
     def get_recent_extractions(self, limit: int = 10) -> list:
         """Get recent extractions as list of {key, value} dicts."""
@@ -1,16 +1,22 @@
 """Tools - simple tool executor."""
 
-from typing import Dict, Any, Optional, Callable
+from asyncio import iscoroutinefunction
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Callable, Tuple
 
 
 class ToolDefinition:
     """Tool definition with metadata."""
-    
+
+    __slots__ = ("tool_id", "type", "description", "handler", "is_coro")
+
     def __init__(self, tool_id: str, type: str, description: str, handler: Optional[Callable] = None):
         self.tool_id = tool_id
         self.type = type
         self.description = description
         self.handler = handler
+        # Computed once here so execute() never pays per-call introspection
+        self.is_coro = handler is not None and iscoroutinefunction(handler)
 
 
 class ToolRegistry:
@@ -18,16 +24,27 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, ToolDefinition] = {}
-    
+        # Read-only live view handed out by get_all; shares the dict
+        self._view: Mapping[str, ToolDefinition] = MappingProxyType(self._tools)
+        self._cached_dict: Optional[dict] = None
+
     def register(self, tool_id: str, type: str, description: str, handler: Optional[Callable] = None):
         """Register a tool."""
         self._tools[tool_id] = ToolDefinition(tool_id, type, description, handler)
-    
+        self._cached_dict = None
+
     def get(self, tool_id: str) -> Optional[ToolDefinition]:
         return self._tools.get(tool_id)
-    
+
+    def get_all(self) -> Mapping[str, ToolDefinition]:
+        """All registered tools as a read-only view (no copy)."""
+        return self._view
+
     def to_dict(self) -> dict:
-        return {tid: {"type": t.type, "description": t.description} for tid, t in self._tools.items()}
+        # Rebuilt only after a register(); called on every prompt assembly
+        if self._cached_dict is None:
+            self._cached_dict = {tid: {"type": t.type, "description": t.description} for tid, t in self._tools.items()}
+        return self._cached_dict
 
 
 class ToolExecutor:
@@ -41,10 +58,38 @@ class ToolExecutor:
         tool = self.registry.get(tool_id)
         if not tool or not tool.handler:
             return None
-        
-        result = tool.handler(**args)
+
+        if tool.is_coro:
+            import asyncio
+            result = asyncio.run(tool.handler(**args))
+        else:
+            result = tool.handler(**args)
         return result if isinstance(result, dict) else None
 
+    def execute_many(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """Execute several independent tool calls concurrently.
+
+        Tool handlers are typically I/O-bound (HTTP, DB), so overlapping
+        them in a thread pool cuts total latency to roughly the slowest
+        call. Results come back in call order so state merges stay
+        deterministic; a handler exception yields None for that slot.
+        """
+        if not calls:
+            return []
+        def _one(call: Tuple[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            try:
+                return self.execute(call[0], call[1])
+            except Exception:
+                return None
+
+        if len(calls) == 1:
+            return [_one(calls[0])]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(8, len(calls))) as pool:
+            return list(pool.map(_one, calls))
+
 
 # Global registry
 _global_registry = ToolRegistry()
@@ -1,6 +1,7 @@
 """Config loader - parses YAML configuration files."""
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Union
 from ..schemas import TaskDefinition, ExpectDefinition
@@ -9,9 +10,24 @@ from ..adjustments import (
     PlanReplaceBlock, ToneSet, ToneAdd, StateSet
 )
 
+# C-accelerated safe loader when libyaml is available (~2-3x faster parse)
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_config_file(path: str) -> dict:
-    """Load YAML config file with better error handling."""
+    """Load YAML config file with better error handling.
+
+    Parsed configs are cached by (path, mtime); callers get the same
+    dict back until the file changes and must treat it as read-only.
+    """
+    config_path = Path(path)
+    if not config_path.exists():
+        raise FileNotFoundError(f"Config file not found: {path}")
+    return _load_config_cached(str(config_path), config_path.stat().st_mtime)
+
+
+@lru_cache(maxsize=128)
+def _load_config_cached(path: str, mtime: float) -> dict:
     config_path = Path(path)
     try:
         if not config_path.exists():
@@ -25,7 +41,7 @@ def load_config_file(path: str) -> dict:
             raise ValueError(f"Config file is empty: {path}")
 
         try:
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=_LOADER)
             if data is None:
                 raise ValueError(f"Config file contains no valid YAML data: {path}")
             return data
@@ -78,7 +94,7 @@ def parse_adjustments(data: dict) -> List[Adjustment]:
     adjustments = []
     for adj_data in data.get("adjustments", []):
         name = adj_data.get("name", "unnamed")
-        condition = adj_data.get("when", "False")
+        condition = adj_data.get("when", False)
         actions = adj_data.get("actions", [])
         
         # Convert actions to full format / objects
@@ -0,0 +1,37 @@
+"""JSON helpers - use orjson when installed, fall back to stdlib json."""
+
+import json
+from typing import Any
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from a str/bytes payload."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize obj to a JSON string."""
+    if _orjson is not None:
+        # NON_STR_KEYS matches stdlib json, which coerces int/float/bool
+        # keys to strings instead of raising
+        option = _orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, option=option).decode("utf-8")
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes, skipping the str round-trip with orjson."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
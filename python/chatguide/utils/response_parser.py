@@ -1,8 +1,36 @@
 """Response parser - parses LLM responses."""
 
-import json
 from typing import Any, List
 from ..schemas import ChatGuideReply, TaskResult
+from . import fast_json
+
+
+def _dedupe_task_results(data: dict) -> dict:
+    """Normalize task_results in place: dedupe by (task_id, key) pair.
+
+    Duplicates are skipped (first occurrence wins) so the same key can
+    still appear for different tasks.
+    """
+    if "task_results" in data and isinstance(data["task_results"], list):
+        # Insertion-ordered dict keyed by (task_id, key): dedupe and
+        # ordering fall out of a single pass without a separate seen-set
+        by_pair = {}
+        for i, tr in enumerate(data["task_results"]):
+            if isinstance(tr, dict):
+                task_id = tr.get("task_id", "")
+                key = tr.get("key", "")
+                if key:
+                    by_pair.setdefault((task_id, key), {
+                        "task_id": task_id,
+                        "key": key,
+                        "value": tr.get("value", "")
+                    })
+            else:
+                # Non-dict entries pass through untouched; index keeps
+                # them from colliding with each other
+                by_pair[i] = tr
+        data["task_results"] = list(by_pair.values())
+    return data
 
 
 def parse_llm_response(raw: Any) -> ChatGuideReply:
@@ -12,54 +40,11 @@ def parse_llm_response(raw: Any) -> ChatGuideReply:
 
     if isinstance(raw, ChatGuideReply):
         return raw
-    
+
     if isinstance(raw, dict):
-        # Handle task_id field from LLM responses
-        # Deduplicate by (task_id, key) pair to allow same key for different tasks
-        if "task_results" in raw and isinstance(raw["task_results"], list):
-            processed_results = []
-            seen = set()
-            for tr in raw["task_results"]:
-                if isinstance(tr, dict):
-                    task_id = tr.get("task_id", "")
-                    key = tr.get("key", "")
-                    pair = (task_id, key)
-                    # Skip duplicates by (task_id, key) pair
-                    if key and pair not in seen:
-                        seen.add(pair)
-                        processed_results.append({
-                            "task_id": task_id,
-                            "key": key,
-                            "value": tr.get("value", "")
-                        })
-                else:
-                    processed_results.append(tr)
-            raw["task_results"] = processed_results
-        return ChatGuideReply.model_validate(raw)
-    
+        return ChatGuideReply.model_validate(_dedupe_task_results(raw))
+
     if isinstance(raw, str):
-        parsed = json.loads(raw)
-        # Handle task_id field from LLM responses
-        # Deduplicate by (task_id, key) pair to allow same key for different tasks
-        if "task_results" in parsed and isinstance(parsed["task_results"], list):
-            processed_results = []
-            seen = set()
-            for tr in parsed["task_results"]:
-                if isinstance(tr, dict):
-                    task_id = tr.get("task_id", "")
-                    key = tr.get("key", "")
-                    pair = (task_id, key)
-                    # Skip duplicates by (task_id, key) pair
-                    if key and pair not in seen:
-                        seen.add(pair)
-                        processed_results.append({
-                            "task_id": task_id,
-                            "key": key,
-                            "value": tr.get("value", "")
-                        })
-                else:
-                    processed_results.append(tr)
-            parsed["task_results"] = processed_results
-        return ChatGuideReply.model_validate(parsed)
-    
+        return ChatGuideReply.model_validate(_dedupe_task_results(fast_json.loads(raw)))
+
     raise ValueError(f"Unexpected response type: {type(raw)}")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Regression tests for delta persistence, the response cache, and history summarization."""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add python directory to path
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir / "python"))
+
+from chatguide import ChatGuide
+from chatguide.io.storage import FileStorage
+
+
+def _state(messages, **extra):
+    state = {"data": {"user_name": "Ada"}, "messages": list(messages), "block": 0}
+    state.update(extra)
+    return state
+
+
+def test_save_delta_round_trip():
+    """save -> save_delta x N -> load replays changed keys and appended messages."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = FileStorage(directory=tmp)
+
+        s1 = _state([{"role": "user", "content": "hi"}], mood="neutral")
+        storage.save("conv", s1)
+
+        # Turn 2: message appended, one key changed
+        s2 = _state(s1["messages"] + [{"role": "assistant", "content": "hello"}],
+                    mood="warm")
+        storage.save_delta("conv", s2)
+
+        # Turn 3: another append, block advances, a key removed
+        s3 = _state(s2["messages"] + [{"role": "user", "content": "bye"}])
+        s3["block"] = 1
+        storage.save_delta("conv", s3)
+
+        loaded = storage.load("conv")
+        assert loaded == s3
+        assert "mood" not in loaded
+
+        # Deltas live in a sidecar, not a rewritten full file
+        assert (Path(tmp) / "conv.deltas.jsonl").exists()
+
+
+def test_save_delta_shrunken_messages():
+    """A shrunken message list (summarization) is stored as a full replacement."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = FileStorage(directory=tmp)
+
+        long_history = [{"role": "user", "content": f"m{i}"} for i in range(6)]
+        storage.save("conv", _state(long_history))
+
+        # Old messages collapsed into a summary: no longer a prefix match
+        shrunk = _state(long_history[-2:], summary="they said m0-m3")
+        storage.save_delta("conv", shrunk)
+
+        loaded = storage.load("conv")
+        assert loaded == shrunk
+        assert len(loaded["messages"]) == 2
+
+
+def test_save_delta_without_baseline_falls_back_to_full_save():
+    """A fresh storage instance (restart) has no snapshot and does a full save."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = FileStorage(directory=tmp)
+        storage.save("conv", _state([{"role": "user", "content": "hi"}]))
+
+        restarted = FileStorage(directory=tmp)
+        s2 = _state([{"role": "user", "content": "hi"},
+                     {"role": "assistant", "content": "hello"}])
+        restarted.save_delta("conv", s2)
+
+        # Full save supersedes the old file and clears any delta sidecar
+        assert not (Path(tmp) / "conv.deltas.jsonl").exists()
+        assert restarted.load("conv") == s2
+
+
+def _guide():
+    config = {
+        "plan": [["get_name"]],
+        "tasks": {
+            "get_name": {
+                "description": "Ask for the user's name",
+                "expects": [{"key": "user_name", "type": "string"}]
+            }
+        }
+    }
+    return ChatGuide(api_key="dummy_key", config=config)
+
+
+def test_response_cache_skips_repeat_calls():
+    """With the cache enabled, a byte-identical prompt never hits run_llm twice."""
+    cg = _guide()
+    cg.enable_response_cache(maxsize=4)
+
+    calls = []
+
+    def fake_run_llm(prompt, **kwargs):
+        calls.append(prompt)
+        result = MagicMock()
+        result.content = ('{"assistant_reply": "hi", "task_results": '
+                          '[{"task_id": "get_name", "key": "user_name", "value": null}], '
+                          '"tools": []}')
+        return result
+
+    import chatguide.io.llm as llm
+    with patch.object(llm, "run_llm", fake_run_llm):
+        first = cg._call_llm("prompt-a", "model", "key")
+        second = cg._call_llm("prompt-a", "model", "key")
+        cg._call_llm("prompt-b", "model", "key")
+
+    assert len(calls) == 2
+    assert first is second
+
+
+def test_response_cache_skips_tool_replies():
+    """Replies that request tools are never served from cache."""
+    cg = _guide()
+    cg.enable_response_cache(maxsize=4)
+
+    calls = []
+
+    def fake_run_llm(prompt, **kwargs):
+        calls.append(prompt)
+        result = MagicMock()
+        result.content = ('{"assistant_reply": "hi", "task_results": [], '
+                          '"tools": [{"tool_id": "t", "options": {}}]}')
+        return result
+
+    import chatguide.io.llm as llm
+    with patch.object(llm, "run_llm", fake_run_llm):
+        cg._call_llm("prompt-a", "model", "key")
+        cg._call_llm("prompt-a", "model", "key")
+
+    assert len(calls) == 2
+
+
+def test_summarizer_collapses_old_history():
+    """Messages beyond 3x the window collapse into state['summary']."""
+    cg = _guide()
+    cg.history_window = 2
+
+    cg.set_summarizer(lambda summary, dropped: f"{summary}+{len(dropped)}".lstrip("+"))
+
+    for i in range(7):
+        cg.add_user_message(f"m{i}")
+
+    # Triggered at the 7th message: 5 dropped, window kept
+    assert len(cg.state["messages"]) == 2
+    assert cg.state["messages"][-1]["content"] == "m6"
+    assert cg.state["summary"] == "5"
+
+
+if __name__ == "__main__":
+    test_save_delta_round_trip()
+    test_save_delta_shrunken_messages()
+    test_save_delta_without_baseline_falls_back_to_full_save()
+    test_response_cache_skips_repeat_calls()
+    test_response_cache_skips_tool_replies()
+    test_summarizer_collapses_old_history()
+    print("All storage/cache/summarizer tests passed")